@@ -1,9 +1,23 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import ezdxf
 from ezdxf import DXFStructureError
+from ezdxf.filemanagement import dxf_file_info
+from ezdxf.lldxf.validator import is_binary_dxf_file, is_dxf_file
+import numpy as np
+import orjson
+import asyncio
+import hashlib
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from itertools import chain
 import tempfile
+import math
+import multiprocessing
 import os
 from typing import Optional
 import logging
@@ -11,7 +25,69 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="DWG Extractor", version="1.0.0")
+# Tamaño de bloque para copiar el archivo subido a disco
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Elementos que se arman y serializan juntos al enviar la respuesta
+STREAM_BATCH_SIZE = 1024
+
+# Directorio de la copia temporal del DXF (por defecto, el temp del sistema).
+# Opcionalmente un tmpfs (p. ej. /dev/shm) para que ezdxf lea el DXF desde RAM;
+# debe tener espacio para todas las subidas concurrentes (en Docker, /dev/shm
+# es de 64 MB salvo que se ajuste shm_size)
+UPLOAD_DIR = os.environ.get("UPLOAD_DIR") or None
+
+# Buffer de lectura del DXF durante el parseo
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Procesos del pool de extracción (por worker de uvicorn). Las peticiones se
+# parsean en paralelo, una por proceso
+EXTRACTOR_WORKERS = int(os.environ.get("EXTRACTOR_WORKERS", 0)) or os.cpu_count()
+
+# Resultados de extracción recientes por SHA-256 del archivo (LRU): evita
+# reparsear el mismo dibujo cuando se sube varias veces. El presupuesto se mide
+# en bytes de DXF subido (la extracción ocupa varias veces eso en memoria) y es
+# por worker de uvicorn; 0 desactiva la caché
+RESULT_CACHE_BYTES = int(os.environ.get("RESULT_CACHE_BYTES", 32 * 1024 * 1024))
+result_cache = OrderedDict()  # digest -> (extracción, bytes del archivo)
+result_cache_bytes = 0
+
+# Un DXF ASCII empieza con un group code ("0" o "  0"); uno binario con este
+# centinela
+BINARY_DXF_SENTINEL = b"AutoCAD Binary DXF"
+
+# Los DWG empiezan con "AC" + código de versión; nombre de los más comunes
+DWG_VERSIONS = {
+    b"AC1032": "AutoCAD 2018-2021",
+    b"AC1027": "AutoCAD 2013-2017",
+    b"AC1024": "AutoCAD 2010-2012",
+    b"AC1021": "AutoCAD 2007-2009",
+    b"AC1018": "AutoCAD 2004-2006",
+}
+
+
+def new_process_pool() -> ProcessPoolExecutor:
+    """Pool de procesos para el parseo de DXF (CPU) fuera del event loop"""
+    # forkserver: los hijos no se crean con fork() desde un proceso con hilos
+    return ProcessPoolExecutor(
+        max_workers=EXTRACTOR_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver"),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.process_pool = new_process_pool()
+    yield
+    app.state.process_pool.shutdown()
+
+
+app = FastAPI(
+    title="DWG Extractor",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,33 +101,400 @@ def detect_file_format(file_path: str) -> dict:
     """Detecta si el archivo es DXF o DWG"""
     with open(file_path, "rb") as f:
         header = f.read(100)
+        file_size = os.fstat(f.fileno()).st_size
 
     # DXF es texto ASCII, DWG es binario
-    try:
-        text = header[:50].decode("ascii")
-        is_dxf = "0\n" in text or "SECTION" in text or "HEADER" in text
-    except:
-        is_dxf = False
-
-    is_dwg = header.startswith(b"AC")
+    is_dxf = header.lstrip()[:1].isdigit() or header.startswith(BINARY_DXF_SENTINEL)
+    is_dwg = header[:2] == b"AC"
 
     version = "Unknown"
     if is_dwg:
-        version_code = header[0:6].decode("ascii", errors="ignore")
-        versions = {
-            "AC1032": "AutoCAD 2018-2021",
-            "AC1027": "AutoCAD 2013-2017",
-            "AC1024": "AutoCAD 2010-2012",
-            "AC1021": "AutoCAD 2007-2009",
-            "AC1018": "AutoCAD 2004-2006",
-        }
-        version = versions.get(version_code, version_code)
+        version_code = header[:6]
+        version = DWG_VERSIONS.get(version_code) or version_code.decode(
+            "ascii", errors="replace"
+        )
 
     return {
         "is_dxf": is_dxf,
         "is_dwg": is_dwg,
         "version": version,
-        "file_size": os.path.getsize(file_path),
+        "file_size": file_size,
+    }
+
+
+def copy_upload(src, dst) -> Optional[str]:
+    """Copia el archivo subido a disco por bloques y devuelve su SHA-256 (None si
+    la caché de resultados está desactivada: no se calcula)"""
+    if RESULT_CACHE_BYTES <= 0:
+        shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
+        return None
+
+    digest = hashlib.sha256()
+    while chunk := src.read(UPLOAD_CHUNK_SIZE):
+        digest.update(chunk)
+        dst.write(chunk)
+    return digest.hexdigest()
+
+
+def cache_get(digest: str) -> Optional[dict]:
+    """Extracción cacheada para el SHA-256 dado (y la marca como reciente)"""
+    entry = result_cache.get(digest)
+    if entry is None:
+        return None
+    result_cache.move_to_end(digest)
+    return entry[0]
+
+
+def cache_put(digest: str, extraction: dict, size: int) -> None:
+    """Cachea una extracción dentro de RESULT_CACHE_BYTES, desalojando la más vieja"""
+    global result_cache_bytes
+    if size > RESULT_CACHE_BYTES or digest in result_cache:
+        return
+    result_cache[digest] = (extraction, size)
+    result_cache_bytes += size
+    while result_cache_bytes > RESULT_CACHE_BYTES:
+        _, (_, evicted_size) = result_cache.popitem(last=False)
+        result_cache_bytes -= evicted_size
+
+
+def safe_unlink(path: Optional[str]) -> None:
+    """Borra un archivo temporal; ignora si no existe o no se llegó a crear"""
+    try:
+        os.unlink(path)
+    except (OSError, TypeError):
+        # FileNotFoundError incluido; un fallo al limpiar no debe romper la respuesta
+        pass
+
+
+def read_dxf(file_path: str):
+    """Como ezdxf.readfile, pero leyendo el DXF ASCII con un buffer grande"""
+    if is_binary_dxf_file(file_path):
+        return ezdxf.readfile(file_path)
+    if not is_dxf_file(file_path):
+        raise IOError(f"File '{file_path}' is not a DXF file.")
+
+    info = dxf_file_info(file_path)
+    with open(
+        file_path,
+        mode="rt",
+        encoding=info.encoding,
+        errors="surrogateescape",
+        buffering=READ_BUFFER_SIZE,
+    ) as fp:
+        return ezdxf.read(fp)
+
+
+class DXFReadError(Exception):
+    """El DXF no se pudo leer; `detail` se devuelve tal cual en el 400"""
+
+    def __init__(self, detail: dict):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class EntityBuffer:
+    """Columnas (structure-of-arrays) de las entidades de un mismo tipo"""
+
+    def __init__(self, width: int):
+        self.layers = []
+        self.columns = [[] for _ in range(width)]
+
+    def append(self, layer: str, values: tuple) -> None:
+        self.layers.append(layer)
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+
+def clean_text(value: str) -> str:
+    """Reemplaza por U+FFFD lo que no se puede codificar en UTF-8"""
+    # read_dxf usa errors="surrogateescape": los bytes no decodificables llegan
+    # como surrogates sueltos, que orjson rechaza en medio del streaming
+    try:
+        value.encode("utf-8")
+        return value
+    except UnicodeEncodeError:
+        pass
+    try:
+        raw = value.encode("utf-8", "surrogateescape")
+    except UnicodeEncodeError:
+        raw = value.encode("utf-8", "surrogatepass")
+    return raw.decode("utf-8", "replace")
+
+
+def to_lists(points: list) -> list:
+    """Convierte una columna de puntos en listas con una sola llamada a numpy"""
+    return np.array(points, dtype=np.float64).tolist()
+
+
+def line_lengths(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Longitud de cada línea a partir de arrays (N, 3) de inicios y fines"""
+    delta = ends - starts
+    return np.sqrt(np.einsum("ij,ij->i", delta, delta))
+
+
+# Extractores: devuelven una fila de valores crudos por entidad
+
+
+def extract_line(entity) -> tuple:
+    dxf = entity.dxf
+    return dxf.start.xyz, dxf.end.xyz
+
+
+def extract_circle(entity) -> tuple:
+    dxf = entity.dxf
+    return dxf.center.xyz, dxf.radius
+
+
+def extract_arc(entity) -> tuple:
+    dxf = entity.dxf
+    return dxf.center.xyz, dxf.radius, dxf.start_angle, dxf.end_angle
+
+
+def extract_text(entity) -> tuple:
+    dxf = entity.dxf
+    return clean_text(dxf.text), dxf.insert.xyz, dxf.height
+
+
+def extract_mtext(entity) -> tuple:
+    return clean_text(entity.text), entity.dxf.insert.xyz
+
+
+def extract_lwpolyline(entity) -> tuple:
+    # Los vértices (x, y, start_width, end_width, bulge) ya están en un
+    # array("d") contiguo: se leen sin copiar
+    lwpoints = entity.lwpoints
+    points = np.frombuffer(lwpoints.values, dtype=np.float64).reshape(
+        -1, lwpoints.VERTEX_SIZE
+    )
+    return points, entity.closed
+
+
+def extract_polyline(entity) -> tuple:
+    vertices = entity.vertices
+    points = np.fromiter(
+        chain.from_iterable(v.dxf.location for v in vertices),
+        dtype=np.float64,
+        count=3 * len(vertices),
+    ).reshape(-1, 3)
+    return points, entity.is_closed
+
+
+def extract_spline(entity) -> tuple:
+    # Splines son curvas complejas
+    return entity.dxf.degree, len(entity.control_points)
+
+
+# Builders: arman los dicts de "data" a partir de las columnas, en bloque
+
+
+def build_lines(starts: list, ends: list) -> list:
+    starts = np.array(starts, dtype=np.float64)
+    ends = np.array(ends, dtype=np.float64)
+    lengths = np.round(line_lengths(starts, ends), 4)
+    return [
+        {"start": start, "end": end, "length": length}
+        for start, end, length in zip(
+            starts.tolist(), ends.tolist(), lengths.tolist()
+        )
+    ]
+
+
+def build_circles(centers: list, radii: list) -> list:
+    radii = np.array(radii, dtype=np.float64)
+    areas = np.round(math.pi * radii * radii, 4)
+    return [
+        {"center": center, "radius": radius, "area": area}
+        for center, radius, area in zip(
+            to_lists(centers), np.round(radii, 4).tolist(), areas.tolist()
+        )
+    ]
+
+
+def build_arcs(
+    centers: list, radii: list, start_angles: list, end_angles: list
+) -> list:
+    return [
+        {
+            "center": center,
+            "radius": radius,
+            "start_angle": start_angle,
+            "end_angle": end_angle,
+        }
+        for center, radius, start_angle, end_angle in zip(
+            to_lists(centers),
+            np.round(np.array(radii, dtype=np.float64), 4).tolist(),
+            np.round(np.array(start_angles, dtype=np.float64), 2).tolist(),
+            np.round(np.array(end_angles, dtype=np.float64), 2).tolist(),
+        )
+    ]
+
+
+def build_texts(texts: list, inserts: list, heights: list) -> list:
+    return [
+        {"text": text, "insert": insert, "height": height}
+        for text, insert, height in zip(
+            texts,
+            to_lists(inserts),
+            np.round(np.array(heights, dtype=np.float64), 4).tolist(),
+        )
+    ]
+
+
+def build_mtexts(texts: list, inserts: list) -> list:
+    return [
+        {"text": text, "insert": insert}
+        for text, insert in zip(texts, to_lists(inserts))
+    ]
+
+
+def build_polylines(points: list, closed: list) -> list:
+    # Todos los vértices se convierten juntos y luego se reparten por entidad
+    all_points = np.concatenate(points).tolist()
+    rows = []
+    offset = 0
+    for entity_points, is_closed in zip(points, closed):
+        count = len(entity_points)
+        rows.append(
+            {
+                "points": all_points[offset : offset + count],
+                "closed": is_closed,
+                "point_count": count,
+            }
+        )
+        offset += count
+    return rows
+
+
+def build_splines(degrees: list, control_point_counts: list) -> list:
+    return [
+        {"degree": degree, "control_point_count": count}
+        for degree, count in zip(degrees, control_point_counts)
+    ]
+
+
+# Extractor y builder por tipo de entidad (DXFTYPE)
+EXTRACTORS = {
+    "LINE": extract_line,
+    "CIRCLE": extract_circle,
+    "ARC": extract_arc,
+    "TEXT": extract_text,
+    "MTEXT": extract_mtext,
+    "LWPOLYLINE": extract_lwpolyline,
+    "POLYLINE": extract_polyline,
+    "SPLINE": extract_spline,
+}
+
+BUILDERS = {
+    "LINE": build_lines,
+    "CIRCLE": build_circles,
+    "ARC": build_arcs,
+    "TEXT": build_texts,
+    "MTEXT": build_mtexts,
+    "LWPOLYLINE": build_polylines,
+    "POLYLINE": build_polylines,
+    "SPLINE": build_splines,
+}
+
+
+def iter_elements(order: list, buffers: dict):
+    """Genera los elementos por lotes, en el orden original del modelspace"""
+    offsets = dict.fromkeys(buffers, 0)
+    for start in range(0, len(order), STREAM_BATCH_SIZE):
+        batch = order[start : start + STREAM_BATCH_SIZE]
+
+        # Cada tipo arma en bloque solo las filas que caen en este lote
+        rows = {}
+        for kind, count in Counter(batch).items():
+            buffer = buffers[kind]
+            offset = offsets[kind]
+            end = offsets[kind] = offset + count
+            layers = buffer.layers[offset:end]
+            builder = BUILDERS.get(kind)
+            if builder:
+                data = builder(*(column[offset:end] for column in buffer.columns))
+            else:
+                # Otras entidades (sin extractor): solo metadata
+                data = [{"type": kind} for _ in layers]
+            rows[kind] = zip(layers, data)
+
+        elements = []
+        for kind in batch:
+            layer, data = next(rows[kind])
+            elements.append({"kind": kind, "layer": layer, "data": data})
+        yield elements
+
+
+def stream_json(summary: bytes, extraction: dict):
+    """Genera el JSON de la respuesta: `summary` (ya serializado) + "elements"
+    serializado por lotes"""
+    yield summary[:-1] + b',"elements":['
+    separator = b""
+    for elements in iter_elements(extraction["order"], extraction["buffers"]):
+        yield separator + orjson.dumps(elements)[1:-1]
+        separator = b","
+    yield b"]}"
+
+
+def extract_entities(file_path: str) -> dict:
+    """Lee el DXF y extrae sus entidades (se ejecuta en el pool de procesos)"""
+    # Intentar leer el DXF
+    try:
+        logger.info("📖 Reading DXF file...")
+        doc = read_dxf(file_path)
+        logger.info("✅ DXF loaded successfully")
+    except DXFStructureError as e:
+        logger.error(f"❌ DXF structure error: {e}")
+        raise DXFReadError(
+            {
+                "error": "Archivo DXF corrupto o inválido",
+                "message": str(e),
+                "suggestion": "Intenta guardar el archivo nuevamente desde AutoCAD",
+            }
+        )
+    except Exception as e:
+        logger.error(f"❌ Error reading file: {e}")
+        raise DXFReadError(
+            {
+                "error": "No se pudo leer el archivo",
+                "message": str(e),
+                "suggestion": "Asegúrate de que sea un archivo DXF válido (ASCII, no Binary)",
+            }
+        )
+
+    # Extraer entidades en columnas por tipo; `order` conserva el orden original
+    msp = doc.modelspace()
+    buffers = {}
+    order = []
+    entity_stats = {}
+
+    for entity in msp:
+        kind = clean_text(entity.dxftype())
+        layer = clean_text(entity.dxf.layer)
+
+        # Estadísticas
+        entity_stats[kind] = entity_stats.get(kind, 0) + 1
+
+        extractor = EXTRACTORS.get(kind)
+
+        try:
+            values = extractor(entity) if extractor else ()
+        except Exception as e:
+            logger.warning(f"⚠️  Error processing {kind} entity: {e}")
+            continue
+
+        buffer = buffers.get(kind)
+        if buffer is None:
+            buffer = buffers[kind] = EntityBuffer(len(values))
+        buffer.append(layer, values)
+        order.append(kind)
+
+    # Se devuelven las columnas, no los dicts: viajan compactas desde el pool
+    # y los elementos se arman al enviar la respuesta (ver stream_json)
+    return {
+        "order": order,
+        "buffers": buffers,
+        "total_entities": len(order),
+        "entity_statistics": entity_stats,
     }
 
 
@@ -80,7 +523,7 @@ async def health_check():
     }
 
 
-@app.post("/extract")
+@app.post("/extract", response_model=None)
 async def extract_dwg(file: Optional[UploadFile] = File(None)):
     logger.info(f"=== New Request ===")
 
@@ -92,17 +535,20 @@ async def extract_dwg(file: Optional[UploadFile] = File(None)):
     temp_path = None
 
     try:
-        # Guardar archivo
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".dxf") as tmp:
-            content = await file.read()
-            logger.info(f"✅ Read {len(content)} bytes")
+        # Guardar archivo por bloques en un hilo: no se carga entero en memoria
+        # ni se bloquea el event loop. El hash para la caché se calcula en la
+        # misma pasada
+        with tempfile.NamedTemporaryFile(
+            delete=False, suffix=".dxf", dir=UPLOAD_DIR
+        ) as tmp:
+            temp_path = tmp.name
+            digest = await asyncio.to_thread(copy_upload, file.file, tmp)
+            size = tmp.tell()
+            logger.info(f"✅ Read {size} bytes")
 
-            if len(content) == 0:
+            if size == 0:
                 raise HTTPException(400, "El archivo está vacío")
 
-            tmp.write(content)
-            temp_path = tmp.name
-
         # Detectar formato
         file_info = detect_file_format(temp_path)
         logger.info(f"📊 File info: {file_info}")
@@ -110,7 +556,7 @@ async def extract_dwg(file: Optional[UploadFile] = File(None)):
         # Si es DWG, rechazar con instrucciones
         if file_info["is_dwg"] and not file_info["is_dxf"]:
             logger.warning("❌ DWG file detected, conversion required")
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=400,
                 content={
                     "error": "Archivo DWG no soportado",
@@ -146,119 +592,57 @@ async def extract_dwg(file: Optional[UploadFile] = File(None)):
                 },
             )
 
-        # Intentar leer el DXF
-        try:
-            logger.info("📖 Reading DXF file...")
-            doc = ezdxf.readfile(temp_path)
-            logger.info("✅ DXF loaded successfully")
-        except DXFStructureError as e:
-            logger.error(f"❌ DXF structure error: {e}")
-            raise HTTPException(
-                400,
-                detail={
-                    "error": "Archivo DXF corrupto o inválido",
-                    "message": str(e),
-                    "suggestion": "Intenta guardar el archivo nuevamente desde AutoCAD",
-                },
-            )
-        except Exception as e:
-            logger.error(f"❌ Error reading file: {e}")
-            raise HTTPException(
-                400,
-                detail={
-                    "error": "No se pudo leer el archivo",
-                    "message": str(e),
-                    "suggestion": "Asegúrate de que sea un archivo DXF válido (ASCII, no Binary)",
-                },
-            )
-
-        # Extraer entidades
-        msp = doc.modelspace()
-        results = []
-        entity_stats = {}
-
-        for entity in msp:
-            kind = entity.dxftype()
-            layer = entity.dxf.layer
-
-            # Estadísticas
-            entity_stats[kind] = entity_stats.get(kind, 0) + 1
-
-            entity_data = {}
-
+        # Leer y extraer en el pool de procesos para no bloquear el event loop,
+        # salvo que el mismo archivo se haya procesado hace poco
+        extraction = cache_get(digest) if digest else None
+        if extraction is not None:
+            logger.info("♻️  Same file processed recently, using cached result")
+        else:
+            loop = asyncio.get_running_loop()
+            pool = app.state.process_pool
             try:
-                if kind == "LINE":
-                    entity_data = {
-                        "start": list(entity.dxf.start),
-                        "end": list(entity.dxf.end),
-                        "length": round(entity.dxf.start.distance(entity.dxf.end), 4),
-                    }
-                elif kind == "CIRCLE":
-                    entity_data = {
-                        "center": list(entity.dxf.center),
-                        "radius": round(entity.dxf.radius, 4),
-                        "area": round(3.14159 * entity.dxf.radius**2, 4),
-                    }
-                elif kind == "ARC":
-                    entity_data = {
-                        "center": list(entity.dxf.center),
-                        "radius": round(entity.dxf.radius, 4),
-                        "start_angle": round(entity.dxf.start_angle, 2),
-                        "end_angle": round(entity.dxf.end_angle, 2),
-                    }
-                elif kind == "TEXT":
-                    entity_data = {
-                        "text": entity.dxf.text,
-                        "insert": list(entity.dxf.insert),
-                        "height": round(entity.dxf.height, 4),
-                    }
-                elif kind == "MTEXT":
-                    entity_data = {
-                        "text": entity.text,
-                        "insert": list(entity.dxf.insert),
-                    }
-                elif kind == "LWPOLYLINE":
-                    points = [list(p) for p in entity.get_points()]
-                    entity_data = {
-                        "points": points,
-                        "closed": entity.closed,
-                        "point_count": len(points),
-                    }
-                elif kind == "POLYLINE":
-                    points = [list(v.dxf.location) for v in entity.vertices]
-                    entity_data = {
-                        "points": points,
-                        "closed": entity.is_closed,
-                        "point_count": len(points),
-                    }
-                elif kind == "SPLINE":
-                    # Splines son curvas complejas
-                    entity_data = {
-                        "degree": entity.dxf.degree,
-                        "control_point_count": len(entity.control_points),
-                    }
-                else:
-                    # Otras entidades: solo metadata
-                    entity_data = {"type": kind}
-
-                results.append({"kind": kind, "layer": layer, "data": entity_data})
-
-            except Exception as e:
-                logger.warning(f"⚠️  Error processing {kind} entity: {e}")
-                continue
-
-        logger.info(f"✅ Extracted {len(results)} entities")
+                extraction = await loop.run_in_executor(
+                    pool, extract_entities, temp_path
+                )
+            except DXFReadError as e:
+                raise HTTPException(400, detail=e.detail)
+            except BrokenProcessPool as e:
+                # Un hijo murió (OOM, crash): el pool queda inutilizable, se
+                # reemplaza para las próximas peticiones (una sola vez si varias
+                # peticiones fallan a la vez)
+                logger.error(f"❌ Extraction process died: {e}")
+                if app.state.process_pool is pool:
+                    pool.shutdown(wait=False)
+                    app.state.process_pool = new_process_pool()
+                raise HTTPException(
+                    500,
+                    "Error interno: el proceso de extracción terminó inesperadamente",
+                )
+
+            if digest:
+                cache_put(digest, extraction, size)
+
+        total_entities = extraction["total_entities"]
+        entity_stats = extraction["entity_statistics"]
+
+        logger.info(f"✅ Extracted {total_entities} entities")
         logger.info(f"📊 Entity stats: {entity_stats}")
 
-        return {
+        # Los elementos se arman y serializan por lotes mientras se envían: no
+        # se mantiene en memoria la lista completa ni el JSON entero
+        summary = {
             "success": True,
             "file_name": file.filename,
             "file_format": "DXF",
             "file_size_bytes": file_info["file_size"],
-            "total_entities": len(results),
+            "total_entities": total_entities,
             "entity_statistics": entity_stats,
-            "elements": results,
         }
+        # El resumen se serializa antes de enviar el status: si falla, es un 500
+        return StreamingResponse(
+            stream_json(orjson.dumps(summary), extraction),
+            media_type="application/json",
+        )
 
     except HTTPException:
         raise
@@ -266,14 +650,18 @@ async def extract_dwg(file: Optional[UploadFile] = File(None)):
         logger.error(f"❌ Unexpected error: {e}", exc_info=True)
         raise HTTPException(500, f"Error interno: {str(e)}")
     finally:
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+        safe_unlink(temp_path)
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8083, log_level="info")
+    # Event loop y parser HTTP en C (incluidos en uvicorn[standard])
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8083,
+        log_level="info",
+        loop="uvloop",
+        http="httptools",
+    )